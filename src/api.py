@@ -1,9 +1,28 @@
-from fastapi import FastAPI, HTTPException, Path, Query
+from fastapi import FastAPI, HTTPException, Path, Query, Response
+from fastapi.responses import JSONResponse
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
 from botocore.exceptions import ClientError
-import boto3
+from cachetools import TTLCache
+from pydantic import BaseModel
+from collections import namedtuple
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
+import asyncio
 import os
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+from operator import itemgetter
+import csv
+import json
 import re
+import weakref
+import zlib
+
+@asynccontextmanager
+async def lifespan(app):
+    """Close the shared AWS clients when the application shuts down"""
+    yield
+    await close_clients()
 
 # Initialize FastAPI with more complete metadata for better Swagger docs
 app = FastAPI(
@@ -15,29 +34,68 @@ app = FastAPI(
     openapi_url="/openapi.json",  # OpenAPI schema endpoint
     license_info={
         "name": "GPLv3",
-    }
+    },
+    lifespan=lifespan
 )
 
+# Response models. Declaring them lets FastAPI serialize responses directly
+# to JSON bytes with Pydantic instead of walking plain dicts
+class NewestObject(BaseModel):
+    key: str
+    last_modified: datetime
+    age_seconds: float
+
+class FreshnessResponse(BaseModel):
+    status: str = "ok"
+    newest_object: NewestObject
+
+class BucketUsage(BaseModel):
+    object_count: int
+    total_size_bytes: int
+    total_size_formatted: str
+
+class UsageResponse(BaseModel):
+    status: str = "ok"
+    bucket: str
+    usage: BucketUsage
+
+class HealthResponse(BaseModel):
+    status: str = "ok"
+
+@app.exception_handler(Exception)
+async def unexpected_error_handler(request, exc):
+    """Report unexpected errors in the same shape as failed checks"""
+    return JSONResponse(
+        status_code=500,
+        content={"detail": {"status": "fail", "reason": f"Unexpected error: {str(exc)}"}}
+    )
+
+# Duration format shared by the max_age query validation and parse_duration
+_DURATION_RE = re.compile(r'^\d+[hmd]$')
+
+# Seconds in each duration unit
+_DURATION_UNIT_SECONDS = {'h': 3600, 'm': 60, 'd': 86400}
+_DEFAULT_MAX_AGE = timedelta(hours=24)
+
+# Monitoring systems send the same few max_age values, so parsed durations are memoized
+@lru_cache(maxsize=128)
 def parse_duration(duration_str):
     """Parse duration strings like '24h', '30m', '1d' into timedelta objects"""
     if not duration_str:
-        return timedelta(hours=24)  # Default 24 hours
+        return _DEFAULT_MAX_AGE
 
-    match = re.match(r'^(\d+)([hmd])$', duration_str)
-    if not match:
+    if not _DURATION_RE.fullmatch(duration_str):
         raise ValueError(f"Invalid duration format: {duration_str}. Use format like '24h', '60m', or '2d'")
 
-    value, unit = match.groups()
-    value = int(value)
+    return timedelta(seconds=int(duration_str[:-1]) * _DURATION_UNIT_SECONDS[duration_str[-1]])
 
-    if unit == 'h':
-        return timedelta(hours=value)
-    elif unit == 'm':
-        return timedelta(minutes=value)
-    elif unit == 'd':
-        return timedelta(days=value)
-    else:
-        raise ValueError(f"Invalid time unit: {unit}")
+def format_size(size_bytes):
+    """Format a size in bytes using the most appropriate unit"""
+    if size_bytes >= 1 << 30:
+        return f"{size_bytes / (1 << 30):.2f} GB"
+    if size_bytes >= 1 << 20:
+        return f"{size_bytes / (1 << 20):.2f} MB"
+    return f"{size_bytes} B"
 
 def parse_bool_env(var_name, default=True):
     """Parse a boolean environment variable from common truthy and falsy strings"""
@@ -53,44 +111,105 @@ def parse_bool_env(var_name, default=True):
 
     return default
 
-def get_s3_client():
-    """Create and return an S3 client with configured credentials"""
-    verify_tls = parse_bool_env("S3_VERIFY_TLS", default=True)
-    return boto3.client(
-        "s3",
-        endpoint_url=os.environ.get("S3_ENDPOINT") or "https://s3.amazonaws.com",
-        aws_access_key_id=os.environ.get("S3_KEY"),
-        aws_secret_access_key=os.environ.get("S3_SECRET"),
-        verify=verify_tls,
-    )
-
-def check_bucket_access(s3, bucket_name):
-    """Check if the bucket exists and is accessible"""
+# S3 connection settings are read once at startup
+S3_ENDPOINT = os.environ.get("S3_ENDPOINT") or "https://s3.amazonaws.com"
+S3_KEY = os.environ.get("S3_KEY")
+S3_SECRET = os.environ.get("S3_SECRET")
+S3_VERIFY_TLS = parse_bool_env("S3_VERIFY_TLS", default=True)
+S3_LIST_CONCURRENCY = int(os.environ.get("S3_LIST_CONCURRENCY") or 16)
+CACHE_TTL = float(os.environ.get("CACHE_TTL") or 30)
+S3_INVENTORY_LOCATION = os.environ.get("S3_INVENTORY_LOCATION")
+S3_INVENTORY_CONCURRENCY = int(os.environ.get("S3_INVENTORY_CONCURRENCY") or 4)
+
+# Clients are shared by all requests so their connection pools and
+# keep-alive TLS sessions are reused instead of rebuilt on every call
+_session = get_session()
+_clients = {}
+_clients_lock = asyncio.Lock()
+_clients_stack = AsyncExitStack()
+
+# Limits how many prefix listings run at once across all requests, to stay
+# clear of S3 request-rate throttling (503 SlowDown)
+_list_semaphore = asyncio.Semaphore(S3_LIST_CONCURRENCY)
+
+# Inventory files can be large and take long to stream, so their downloads
+# are limited separately and never hold up listings
+_inventory_semaphore = asyncio.Semaphore(S3_INVENTORY_CONCURRENCY)
+
+async def get_shared_client(service_name, **client_args):
+    """Return the shared client for a service and arguments, creating it on first use"""
+    key = (service_name, tuple(sorted(client_args.items())))
+    if key not in _clients:
+        async with _clients_lock:
+            if key not in _clients:
+                _clients[key] = await _clients_stack.enter_async_context(
+                    _session.create_client(
+                        service_name,
+                        aws_access_key_id=S3_KEY,
+                        aws_secret_access_key=S3_SECRET,
+                        config=AioConfig(
+                            max_pool_connections=50,
+                            connect_timeout=2,
+                            read_timeout=10,
+                            retries={"mode": "adaptive", "max_attempts": 5},
+                        ),
+                        **client_args
+                    )
+                )
+    return _clients[key]
+
+async def get_s3_client():
+    """Return the shared S3 client"""
+    return await get_shared_client("s3", endpoint_url=S3_ENDPOINT, verify=S3_VERIFY_TLS)
+
+async def get_cloudwatch_client(region):
+    """Return the shared CloudWatch client for a region"""
+    return await get_shared_client("cloudwatch", region_name=region)
+
+async def close_clients():
+    """Close the shared clients and release their connections"""
+    await _clients_stack.aclose()
+    _clients.clear()
+
+async def check_bucket_access(s3, bucket_name):
+    """Check if the bucket exists and is accessible, returning its region"""
     try:
-        s3.get_bucket_location(Bucket=bucket_name)
-        return True
+        # A HEAD request has no response body and reports the region in a header
+        bucket = await s3.head_bucket(Bucket=bucket_name)
+        return bucket.get('BucketRegion') or 'us-east-1'
     except ClientError as e:
         raise HTTPException(
             status_code=500,
             detail={"status": "fail", "reason": f"Error accessing bucket: {str(e)}"}
         )
 
-def get_bucket_objects(s3, bucket_name):
-    """Get all objects from a bucket using pagination"""
-    try:
-        all_objects = []
-        paginator = s3.get_paginator('list_objects_v2')
+# Building a paginator creates a new class from the service model, so one
+# list_objects_v2 paginator is kept per client and reused by every listing
+_list_paginators = weakref.WeakKeyDictionary()
 
-        # Iterate through each page of objects
-        for page in paginator.paginate(Bucket=bucket_name):
-            if 'Contents' in page:
-                all_objects.extend(page['Contents'])
+def get_list_paginator(s3):
+    """Return the shared list_objects_v2 paginator of an S3 client"""
+    paginator = _list_paginators.get(s3)
+    if paginator is None:
+        paginator = _list_paginators[s3] = s3.get_paginator('list_objects_v2')
+    return paginator
 
-        return all_objects
+async def iter_bucket_pages(s3, bucket_name, **list_args):
+    """Yield each page of a bucket listing"""
+    try:
+        paginator = get_list_paginator(s3)
+
+        # Iterate through each page of objects, requesting the largest page
+        # S3 allows so listings take as few round trips as possible
+        async for page in paginator.paginate(
+            Bucket=bucket_name,
+            PaginationConfig={'PageSize': 1000},
+            **list_args
+        ):
+            yield page
     except ClientError as e:
-        if "AccessDenied" in str(e) and "ListObjects" in str(e):
-            # Check if bucket exists but we lack list permissions
-            check_bucket_access(s3, bucket_name)
+        # Match on the structured error code rather than the formatted message
+        if e.response.get('Error', {}).get('Code') == 'AccessDenied':
             raise HTTPException(
                 status_code=500,
                 detail={
@@ -104,14 +223,461 @@ def get_bucket_objects(s3, bucket_name):
                 detail={"status": "fail", "reason": f"Error accessing bucket: {str(e)}"}
             )
 
+async def iter_bucket_contents(s3, bucket_name, **list_args):
+    """Yield the objects of each non-empty page of a bucket listing"""
+    async for page in iter_bucket_pages(s3, bucket_name, **list_args):
+        if page.get('Contents'):
+            yield page['Contents']
+
+async def iter_folder_range(s3, bucket_name, prefix, first_key, stop_key):
+    """
+    Yield the objects of a listing below prefix that sit inside a folder and
+    sort from first_key up to, but not including, stop_key.
+    """
+    # first_key is a folder prefix ending in '/', so starting after its name
+    # without the slash skips everything that sorts before the folder
+    pages = iter_bucket_contents(s3, bucket_name, Prefix=prefix, StartAfter=first_key[:-1])
+    async with aclosing(pages):
+        async for contents in pages:
+            # Objects directly under prefix are reported by the delimited listing
+            in_range = [
+                obj for obj in contents
+                if obj['Key'] >= first_key
+                and obj['Key'] < stop_key
+                and '/' in obj['Key'][len(prefix):]
+            ]
+            if in_range:
+                yield in_range
+            if contents[-1]['Key'] >= stop_key:
+                return
+
+async def scan_bucket(s3, bucket_name, reduce_shard, prefix=''):
+    """
+    Apply reduce_shard to every shard of a bucket listing and return the results.
+
+    Paginated listings are strictly sequential, so the bucket root (or the
+    given prefix) is listed with a '/' delimiter, and the folders it reports
+    are split into at most S3_LIST_CONCURRENCY key ranges that are listed
+    concurrently. A bucket with many small folders therefore costs about as
+    many requests as a single listing. The last range ends right after the
+    last folder, but root objects that sort between two folders of the same
+    range are listed again by that range and skipped. reduce_shard receives
+    an async iterator of object pages and is called once for the root
+    objects and once per key range.
+    """
+    common_prefixes = []
+
+    async def root_contents():
+        async for page in iter_bucket_pages(s3, bucket_name, Prefix=prefix, Delimiter='/'):
+            common_prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', ()))
+            if page.get('Contents'):
+                yield page['Contents']
+
+    results = [await reduce_shard(root_contents())]
+    if not common_prefixes:
+        return results
+
+    # Each range starts at a folder and ends where the next range starts.
+    # '0' sorts right after '/', so the last range stops after the last folder
+    shard_count = min(len(common_prefixes), S3_LIST_CONCURRENCY)
+    boundaries = [common_prefixes[i * len(common_prefixes) // shard_count] for i in range(shard_count)]
+
+    async def reduce_range(first_key, stop_key):
+        async with _list_semaphore:
+            return await reduce_shard(iter_folder_range(s3, bucket_name, prefix, first_key, stop_key))
+
+    shard_tasks = [
+        asyncio.create_task(reduce_range(first_key, stop_key))
+        for first_key, stop_key in zip(boundaries, boundaries[1:] + [common_prefixes[-1][:-1] + '0'])
+    ]
+    try:
+        results.extend(await asyncio.gather(*shard_tasks))
+        return results
+    finally:
+        # Stop any remaining shards if one of them failed
+        for task in shard_tasks:
+            task.cancel()
+        await asyncio.gather(*shard_tasks, return_exceptions=True)
+
+_last_modified = itemgetter('LastModified')
+
+async def newest_in_shard(pages, fresh_after=None, found_fresh=None):
+    """
+    Find the most recently modified object in a shard, or None if it is empty.
+
+    When fresh_after is given, listing stops at the first page holding an
+    object modified after it, or once another shard has set found_fresh.
+    """
+    newest_object = None
+    async with aclosing(pages):
+        if found_fresh is not None and found_fresh.is_set():
+            return None
+        async for contents in pages:
+            # Reduce each page as it arrives so the full listing is never held in memory.
+            # botocore parses every LastModified with the same UTC tzinfo instance,
+            # so comparing the datetimes directly is cheaper than converting each
+            # one to a float timestamp first
+            page_newest = max(contents, key=_last_modified)
+            if newest_object is None or page_newest['LastModified'] > newest_object['LastModified']:
+                newest_object = page_newest
+
+            if fresh_after is not None:
+                if newest_object['LastModified'] > fresh_after:
+                    found_fresh.set()
+                if found_fresh.is_set():
+                    break
+    return newest_object
+
+async def find_newest_object(s3, bucket_name, prefix='', fresh_after=None):
+    """
+    Find the most recently modified object in a bucket or under a prefix, or None if there is none.
+
+    When fresh_after is given, all shards stop listing as soon as any of them
+    finds an object modified after it, and that object may not be the newest.
+    """
+    found_fresh = asyncio.Event()
+
+    async def reduce_shard(pages):
+        return await newest_in_shard(pages, fresh_after, found_fresh)
+
+    shard_newest = await scan_bucket(s3, bucket_name, reduce_shard, prefix)
+    return max(filter(None, shard_newest), key=_last_modified, default=None)
+
+async def find_newest_object_by_descent(s3, bucket_name):
+    """
+    Find the newest object in a bucket whose folder names sort in write order.
+
+    At each level of '/'-delimited folders this descends into the folder
+    that sorts last, unless an object at that level sorts after it, and
+    returns the most recently modified object of the level it stops at.
+    A layout such as 2024/01/31/ takes one small listing per level.
+    """
+    prefix = ''
+    while True:
+        newest_object = None
+        last_key = last_prefix = ''
+        async for page in iter_bucket_pages(s3, bucket_name, Prefix=prefix, Delimiter='/'):
+            # S3 returns keys and prefixes in ascending order
+            if page.get('CommonPrefixes'):
+                last_prefix = page['CommonPrefixes'][-1]['Prefix']
+            if page.get('Contents'):
+                last_key = page['Contents'][-1]['Key']
+                page_newest = max(page['Contents'], key=_last_modified)
+                if newest_object is None or page_newest['LastModified'] > newest_object['LastModified']:
+                    newest_object = page_newest
+
+        if not last_prefix or last_key > last_prefix:
+            return newest_object
+        prefix = last_prefix
+
+async def get_object_info(s3, bucket_name, key):
+    """Fetch the metadata of a single object with a HEAD request"""
+    try:
+        head = await s3.head_object(Bucket=bucket_name, Key=key)
+        return {'Key': key, 'LastModified': head['LastModified']}
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+            raise HTTPException(
+                status_code=500,
+                detail={"status": "fail", "reason": f"Object '{key}' not found in bucket '{bucket_name}'"}
+            )
+        raise HTTPException(
+            status_code=500,
+            detail={"status": "fail", "reason": f"Error accessing object: {str(e)}"}
+        )
+
+# strftime directives of the time units finer than a day, finest first,
+# including the glibc '-' flag that drops zero padding
+_PERIOD_STEPS = (
+    (re.compile(r'%-?S'), timedelta(seconds=1)),
+    (re.compile(r'%-?M'), timedelta(minutes=1)),
+    (re.compile(r'%-?[HIkl]'), timedelta(hours=1)),
+)
+
+def recent_period_prefixes(now, prefix_pattern):
+    """
+    Return the prefixes a strftime pattern gives for the current period and the one before it.
+
+    Patterns without a second, minute or hour directive are stepped back a
+    day at a time, so any other directive is treated as a day or longer.
+    """
+    current = now.strftime(prefix_pattern)
+
+    # Step back by the finest time unit in the pattern until the prefix changes
+    step = next(
+        (step for directive, step in _PERIOD_STEPS if directive.search(prefix_pattern)),
+        timedelta(days=1)
+    )
+    moment = now - step
+    oldest = now - timedelta(days=367)
+    while moment.strftime(prefix_pattern) == current and moment > oldest:
+        moment -= step
+
+    previous = moment.strftime(prefix_pattern)
+    return [current, previous] if previous != current else [current]
+
+async def find_newest_object_by_period(s3, bucket_name, prefix_pattern, fresh_after=None):
+    """
+    Find the newest object in a bucket whose keys are grouped by time-based prefixes.
+
+    Only the prefix of the current period is listed, falling back to the
+    previous period when nothing has been written to the current one yet,
+    so at most two prefixes are listed however large the bucket is.
+    """
+    for prefix in recent_period_prefixes(datetime.now(timezone.utc), prefix_pattern):
+        newest_object = await find_newest_object(s3, bucket_name, prefix, fresh_after)
+        if newest_object is not None:
+            return newest_object
+    return None
+
+async def stats_in_shard(pages):
+    """Count the objects in a shard and sum their sizes"""
+    object_count = 0
+    total_size = 0
+    async for contents in pages:
+        object_count += len(contents)
+        total_size += sum(obj.get('Size', 0) for obj in contents)
+    return object_count, total_size
+
+async def stream_bucket_stats(s3, bucket_name):
+    """Count the objects in a bucket and sum their sizes without buffering the listing"""
+    shard_stats = await scan_bucket(s3, bucket_name, stats_in_shard)
+    return sum(count for count, _ in shard_stats), sum(size for _, size in shard_stats)
+
+# Listing results are kept for CACHE_TTL seconds so monitoring probes polling
+# the same bucket do not re-list it on every request. Failed checks are kept
+# too, so a broken bucket is not re-listed by every probe either.
+_listing_cache = TTLCache(maxsize=256, ttl=CACHE_TTL)
+_listing_locks = weakref.WeakValueDictionary()
+_MISSING = object()
+_CachedFailure = namedtuple('_CachedFailure', ['status_code', 'detail'])
+
+async def get_cached_listing(key, compute):
+    """
+    Return the cached listing result for key and whether it was a HIT or a
+    MISS, computing the result on a cache miss.
+
+    Concurrent misses for the same key share a lock, so only the first one
+    lists the bucket and the others reuse its result. An HTTPException from
+    compute is cached and raised again on hits, with an X-Cache header.
+    """
+    result = _listing_cache.get(key, _MISSING)
+    if result is _MISSING:
+        async with _listing_locks.setdefault(key, asyncio.Lock()):
+            result = _listing_cache.get(key, _MISSING)
+            if result is _MISSING:
+                try:
+                    result = _listing_cache[key] = await compute()
+                except HTTPException as e:
+                    _listing_cache[key] = _CachedFailure(e.status_code, e.detail)
+                    e.headers = {**(e.headers or {}), "X-Cache": "MISS"}
+                    raise
+                return result, "MISS"
+
+    if isinstance(result, _CachedFailure):
+        raise HTTPException(status_code=result.status_code, detail=result.detail, headers={"X-Cache": "HIT"})
+    return result, "HIT"
+
+# Daily storage metrics S3 publishes to CloudWatch for every bucket
+_CLOUDWATCH_STORAGE_METRICS = ('NumberOfObjects', 'BucketSizeBytes')
+
+# Storage types that hold archive index overhead or incomplete uploads rather than object data
+_CLOUDWATCH_NON_OBJECT_STORAGE_SUFFIXES = ('Overhead', 'StagingStorage')
+
+def is_object_storage_metric(metric):
+    """Check whether a CloudWatch storage metric measures object data"""
+    if metric['MetricName'] not in _CLOUDWATCH_STORAGE_METRICS:
+        return False
+    storage_type = next((d['Value'] for d in metric['Dimensions'] if d['Name'] == 'StorageType'), '')
+    return not storage_type.endswith(_CLOUDWATCH_NON_OBJECT_STORAGE_SUFFIXES)
+
+async def get_cloudwatch_bucket_stats(s3, bucket_name):
+    """
+    Read a bucket's object count and total size from its CloudWatch storage metrics.
+
+    S3 publishes these metrics once a day, so they lag behind the bucket
+    contents, but reading them costs a few API calls regardless of how many
+    objects the bucket holds. The object count includes noncurrent versions
+    and delete markers.
+    """
+    region = await check_bucket_access(s3, bucket_name)
+    cloudwatch = await get_cloudwatch_client(region)
+    try:
+        # BucketSizeBytes is reported separately for each storage class in
+        # use, so discover the metrics that exist before querying them
+        metrics = []
+        paginator = cloudwatch.get_paginator('list_metrics')
+        async for page in paginator.paginate(
+            Namespace='AWS/S3',
+            Dimensions=[{'Name': 'BucketName', 'Value': bucket_name}]
+        ):
+            metrics.extend(m for m in page['Metrics'] if is_object_storage_metric(m))
+
+        if not metrics:
+            raise HTTPException(
+                status_code=500,
+                detail={"status": "fail", "reason": f"No CloudWatch storage metrics found for bucket '{bucket_name}'"}
+            )
+
+        now = datetime.now(timezone.utc)
+        result = await cloudwatch.get_metric_data(
+            MetricDataQueries=[
+                {
+                    'Id': f'm{i}',
+                    'MetricStat': {'Metric': metric, 'Period': 86400, 'Stat': 'Average'}
+                }
+                for i, metric in enumerate(metrics)
+            ],
+            StartTime=now - timedelta(days=3),
+            EndTime=now,
+            ScanBy='TimestampDescending'
+        )
+    except ClientError as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"status": "fail", "reason": f"Error reading CloudWatch metrics: {str(e)}"}
+        )
+
+    # Sum the most recent datapoint of each metric
+    object_count = 0
+    total_size = 0
+    for data in result['MetricDataResults']:
+        if not data['Values']:
+            continue
+        metric = metrics[int(data['Id'][1:])]
+        if metric['MetricName'] == 'NumberOfObjects':
+            object_count += int(data['Values'][0])
+        else:
+            total_size += int(data['Values'][0])
+    return object_count, total_size
+
+# S3 Inventory writes each daily report under a folder named after its timestamp
+_INVENTORY_REPORT_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}-\d{2}Z/$')
+
+def parse_s3_url(url):
+    """Split an s3://bucket/prefix URL into its bucket and prefix"""
+    bucket, _, prefix = url.removeprefix('s3://').partition('/')
+    return bucket, prefix
+
+async def find_inventory_manifest(s3, bucket_name):
+    """Load the manifest of the newest S3 Inventory report for a bucket, or None if there is none"""
+    inventory_bucket, prefix = parse_s3_url(S3_INVENTORY_LOCATION.replace('{bucket}', bucket_name))
+    if prefix and not prefix.endswith('/'):
+        prefix += '/'
+
+    reports = []
+    async for page in iter_bucket_pages(s3, inventory_bucket, Prefix=prefix, Delimiter='/'):
+        reports.extend(
+            p['Prefix'] for p in page.get('CommonPrefixes', ())
+            if _INVENTORY_REPORT_RE.search(p['Prefix'])
+        )
+    if not reports:
+        return None
+
+    try:
+        manifest = await s3.get_object(Bucket=inventory_bucket, Key=max(reports) + 'manifest.json')
+        body = manifest['Body']
+        async with body:
+            return json.loads(await body.read())
+    except ClientError as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"status": "fail", "reason": f"Error reading inventory manifest: {str(e)}"}
+        )
+
+def sum_inventory_rows(data, columns):
+    """Count the current objects in a block of inventory CSV lines and sum their sizes"""
+    size_column = columns.index('Size')
+    latest_column = columns.index('IsLatest') if 'IsLatest' in columns else None
+    delete_marker_column = columns.index('IsDeleteMarker') if 'IsDeleteMarker' in columns else None
+
+    object_count = 0
+    total_size = 0
+    for row in csv.reader(data.decode().splitlines()):
+        # Versioned inventories also list noncurrent versions and delete markers
+        if latest_column is not None and row[latest_column] == 'false':
+            continue
+        if delete_marker_column is not None and row[delete_marker_column] == 'true':
+            continue
+        object_count += 1
+        total_size += int(row[size_column] or 0)
+    return object_count, total_size
+
+async def stats_in_inventory_file(s3, inventory_bucket, key, columns):
+    """Count the objects in one gzipped inventory CSV file and sum their sizes, streaming it"""
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    pending = b''
+    object_count = 0
+    total_size = 0
+    async with _inventory_semaphore:
+        try:
+            inventory_file = await s3.get_object(Bucket=inventory_bucket, Key=key)
+            body = inventory_file['Body']
+            async with body:
+                async for chunk in body.iter_chunks():
+                    # Only complete lines are parsed, the remainder waits for the next chunk
+                    data, _, pending = (pending + decompressor.decompress(chunk)).rpartition(b'\n')
+                    count, size = sum_inventory_rows(data, columns)
+                    object_count += count
+                    total_size += size
+        except ClientError as e:
+            raise HTTPException(
+                status_code=500,
+                detail={"status": "fail", "reason": f"Error reading inventory file: {str(e)}"}
+            )
+    count, size = sum_inventory_rows(pending + decompressor.flush(), columns)
+    return object_count + count, total_size + size
+
+async def get_inventory_bucket_stats(s3, bucket_name):
+    """
+    Read a bucket's object count and total size from its newest S3 Inventory report.
+
+    Returns None when S3_INVENTORY_LOCATION holds no report for the bucket.
+    Reading the compressed report takes a few large GETs instead of one
+    list request per thousand objects.
+    """
+    manifest = await find_inventory_manifest(s3, bucket_name)
+    # Without a {bucket} placeholder the location can hold another bucket's report
+    if manifest is None or manifest.get('sourceBucket') != bucket_name:
+        return None
+
+    if manifest.get('fileFormat') != 'CSV':
+        raise HTTPException(
+            status_code=500,
+            detail={"status": "fail", "reason": f"Unsupported inventory format: {manifest.get('fileFormat')}. Only CSV inventories can be read."}
+        )
+
+    inventory_bucket = manifest['destinationBucket'].removeprefix('arn:aws:s3:::')
+    columns = [column.strip() for column in manifest['fileSchema'].split(',')]
+    if 'Size' not in columns:
+        raise HTTPException(
+            status_code=500,
+            detail={"status": "fail", "reason": "Inventory report has no Size field. Add Size to the inventory configuration's optional fields."}
+        )
+    file_stats = await asyncio.gather(*(
+        stats_in_inventory_file(s3, inventory_bucket, inventory_file['key'], columns)
+        for inventory_file in manifest['files']
+    ))
+    return sum(count for count, _ in file_stats), sum(size for _, size in file_stats)
+
+async def get_bucket_stats(s3, bucket_name):
+    """Count the objects in a bucket and sum their sizes, from its inventory when one is configured"""
+    if S3_INVENTORY_LOCATION:
+        stats = await get_inventory_bucket_stats(s3, bucket_name)
+        if stats is not None:
+            return stats
+    return await stream_bucket_stats(s3, bucket_name)
+
 @app.get(
     "/buckets/{bucket_name}/freshness",
     status_code=200,
     summary="Check S3 Bucket Object Freshness",
     response_description="Health check result with newest object information",
+    response_model=FreshnessResponse,
     tags=["Health Checks"]
 )
 async def check_bucket_health(
+    response: Response,
     bucket_name: str = Path(
         ...,
         description="Name of the S3 bucket to check",
@@ -121,7 +687,25 @@ async def check_bucket_health(
         None,
         description="Optional maximum age of newest object (format: 24h, 30m, 1d). If not provided, only reports status without age validation.",
         example="12h",
-        regex=r"^\d+[hmd]$"
+        pattern=_DURATION_RE.pattern
+    ),
+    prefix_pattern: str = Query(
+        None,
+        description="Optional strftime pattern of time-based key prefixes (for example %Y/%m/%d/). When provided, only the prefix of the current period is listed, or the previous period if the current one is still empty, instead of the whole bucket.",
+        example="%Y/%m/%d/"
+    ),
+    key: str = Query(
+        None,
+        description="Optional key of an object that is rewritten on every update (for example latest.json). When provided, only that object is checked with a single HEAD request instead of listing the bucket.",
+        example="latest.json"
+    ),
+    latest_prefix: bool = Query(
+        False,
+        description="Set when folder names sort in write order (for example dates like 2024/01/31/). Only the folder that sorts last at each level is listed, instead of the whole bucket."
+    ),
+    stop_early: bool = Query(
+        False,
+        description="With max_age, stop listing as soon as any object younger than max_age is found. The reported object is then a recent object, not necessarily the newest."
     )
 ):
     """
@@ -133,6 +717,14 @@ async def check_bucket_health(
     - Confirms the bucket contains at least one object
     - If max_age is provided, verifies that the newest object is not older than the specified maximum age
 
+    For buckets whose keys start with a time-based prefix, such as
+    2024/01/31/, set prefix_pattern so only the most recent prefix is listed.
+    When the newest object always has the same key, set key to check just
+    that object without listing the bucket. When folder names sort in write
+    order without following a fixed pattern, set latest_prefix to follow
+    the last folder at each level. With max_age, set stop_early to stop
+    listing at the first object that is young enough.
+
     ## Response
     - Returns 200 OK with object details if the check passes
     - Returns 500 Internal Server Error if any check fails
@@ -143,77 +735,98 @@ async def check_bucket_health(
     GET /buckets/my-backup-bucket/freshness?max_age=12h
     ```
     """
-    try:
-        # Parse max age duration only if provided
-        max_age_delta = None
-        if max_age:
-            max_age_delta = parse_duration(max_age)
-
-        # Create S3 client
-        s3 = get_s3_client()
-
-        # Get all objects in the bucket
-        all_objects = get_bucket_objects(s3, bucket_name)
-
-        if not all_objects:
-            raise HTTPException(
-                status_code=500,
-                detail={"status": "fail", "reason": f"Bucket '{bucket_name}' is empty"}
-            )
+    # Parse max age duration only if provided
+    max_age_delta = None
+    if max_age:
+        max_age_delta = parse_duration(max_age)
+
+    # Listings that stop early depend on max_age, so they are cached per max_age
+    early_max_age = max_age if stop_early and max_age else None
+
+    def fresh_after():
+        if early_max_age is None:
+            return None
+        return datetime.now(timezone.utc) - max_age_delta
+
+    # Find the newest object in the bucket
+    s3 = await get_s3_client()
+    if key:
+        newest_object, cache_status = await get_cached_listing(
+            ("object", bucket_name, key),
+            lambda: get_object_info(s3, bucket_name, key)
+        )
+    elif prefix_pattern:
+        newest_object, cache_status = await get_cached_listing(
+            ("freshness", bucket_name, prefix_pattern, early_max_age),
+            lambda: find_newest_object_by_period(s3, bucket_name, prefix_pattern, fresh_after())
+        )
+    elif latest_prefix:
+        newest_object, cache_status = await get_cached_listing(
+            ("freshness-descent", bucket_name),
+            lambda: find_newest_object_by_descent(s3, bucket_name)
+        )
+    else:
+        newest_object, cache_status = await get_cached_listing(
+            ("freshness", bucket_name, None, early_max_age),
+            lambda: find_newest_object(s3, bucket_name, fresh_after=fresh_after())
+        )
 
-        # Sort objects by LastModified (newest first)
-        objects = sorted(all_objects, key=lambda obj: obj['LastModified'], reverse=True)
+    if newest_object is None:
+        if prefix_pattern:
+            reason = f"No objects found under the current or previous '{prefix_pattern}' prefix in bucket '{bucket_name}'"
+        else:
+            reason = f"Bucket '{bucket_name}' is empty"
+        raise HTTPException(
+            status_code=500,
+            detail={"status": "fail", "reason": reason},
+            headers={"X-Cache": cache_status}
+        )
 
-        # Get the newest object
-        newest_object = objects[0]
+    # Calculate age
+    now = datetime.now(timezone.utc)
+    age = now - newest_object['LastModified']
+    age_seconds = age.total_seconds()
 
-        # Calculate age
-        now = datetime.now(timezone.utc)
-        last_modified = newest_object['LastModified']
-        age = now - last_modified
-
-        # Prepare response with newest object info
-        response = {
-            "status": "ok",
-            "newest_object": {
-                "key": newest_object['Key'],
-                "last_modified": last_modified.isoformat(),
-                "age_seconds": age.total_seconds()
-            }
-        }
-
-        # Only check age if max_age was provided
-        if max_age_delta and age > max_age_delta:
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "status": "fail",
-                    "reason": f"Newest object is too old ({age.total_seconds():.0f} seconds, max age: {max_age_delta.total_seconds():.0f} seconds)",
-                    "newest_object": response["newest_object"]
-                }
-            )
+    # Newest object info, shared by the success and failure responses
+    newest_info = NewestObject(
+        key=newest_object['Key'],
+        last_modified=newest_object['LastModified'],
+        age_seconds=age_seconds
+    )
 
-        return response
+    # Only check age if max_age was provided
+    if max_age_delta and age > max_age_delta:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "fail",
+                "reason": f"Newest object is too old ({age_seconds:.0f} seconds, max age: {max_age_delta.total_seconds():.0f} seconds)",
+                "newest_object": newest_info.model_dump(mode="json")
+            },
+            headers={"X-Cache": cache_status}
+        )
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail={"status": "fail", "reason": str(e)})
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail={"status": "fail", "reason": f"Unexpected error: {str(e)}"})
+    response.headers["X-Cache"] = cache_status
+    return FreshnessResponse(newest_object=newest_info)
 
 @app.get(
     "/buckets/{bucket_name}/usage",
     status_code=200,
     summary="Check S3 Bucket Storage Usage",
     response_description="Storage usage information for the bucket",
+    response_model=UsageResponse,
     tags=["Health Checks"]
 )
 async def check_bucket_usage(
+    response: Response,
     bucket_name: str = Path(
         ...,
         description="Name of the S3 bucket to check",
         example="my-data-bucket"
+    ),
+    use_cloudwatch: bool = Query(
+        False,
+        description="Read usage from the daily CloudWatch storage metrics instead of listing the bucket. Only available on AWS; values can be up to a day old, and the object count includes noncurrent versions and delete markers."
     )
 ):
     """
@@ -225,6 +838,11 @@ async def check_bucket_usage(
     - Calculates total storage used
     - Counts the number of objects in the bucket
 
+    For very large buckets, set use_cloudwatch to read the totals from the
+    CloudWatch metrics S3 publishes daily instead of listing every object.
+    When S3_INVENTORY_LOCATION is configured, the newest S3 Inventory report
+    for the bucket is read instead of listing it.
+
     ## Response
     - Returns 200 OK with usage details if the check passes
     - Returns 500 Internal Server Error if any check fails
@@ -234,45 +852,28 @@ async def check_bucket_usage(
     GET /buckets/my-backup-bucket/usage
     ```
     """
-    try:
-        # Create S3 client
-        s3 = get_s3_client()
-
-        # Get all objects in the bucket
-        all_objects = get_bucket_objects(s3, bucket_name)
-
-        # Initialize counters for total size and object count
-        total_size = 0
-        object_count = len(all_objects)
-
-        # Calculate total size
-        for obj in all_objects:
-            total_size += obj.get('Size', 0)
-
-        # Format size in human-readable format
-        size_mb = total_size / (1024 * 1024)
-        size_gb = size_mb / 1024
+    # Count objects and total size across the bucket
+    s3 = await get_s3_client()
+    if use_cloudwatch:
+        (object_count, total_size), cache_status = await get_cached_listing(
+            ("usage-cloudwatch", bucket_name),
+            lambda: get_cloudwatch_bucket_stats(s3, bucket_name)
+        )
+    else:
+        (object_count, total_size), cache_status = await get_cached_listing(
+            ("usage", bucket_name),
+            lambda: get_bucket_stats(s3, bucket_name)
+        )
 
-        # Determine the most appropriate unit
-        if size_gb >= 1:
-            size_formatted = f"{size_gb:.2f} GB"
-        else:
-            size_formatted = f"{size_mb:.2f} MB"
-
-        return {
-            "status": "ok",
-            "bucket": bucket_name,
-            "usage": {
-                "object_count": object_count,
-                "total_size_bytes": total_size,
-                "total_size_formatted": size_formatted
-            }
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail={"status": "fail", "reason": f"Unexpected error: {str(e)}"})
+    response.headers["X-Cache"] = cache_status
+    return UsageResponse(
+        bucket=bucket_name,
+        usage=BucketUsage(
+            object_count=object_count,
+            total_size_bytes=total_size,
+            total_size_formatted=format_size(total_size)
+        )
+    )
 
 # Health check endpoint
 @app.get(
@@ -280,6 +881,7 @@ async def check_bucket_usage(
     status_code=200,
     summary="Health Check Endpoint",
     response_description="Indicates if the API is running",
+    response_model=HealthResponse,
     tags=["Health Checks"]
 )
 async def health_check():
@@ -297,4 +899,4 @@ async def health_check():
     GET /health
     ```
     """
-    return {"status": "ok"}
+    return HealthResponse()
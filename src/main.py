@@ -1,4 +1,5 @@
 import uvicorn
 
 if __name__ == "__main__":
+    # uvicorn picks uvloop and httptools automatically when they are installed
     uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=False)